@@ -2,68 +2,27 @@ import streamlit as st
 import requests
 import json
 import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+import asyncio
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 import google.generativeai as genai
 from datetime import datetime
 import re
 from urllib.parse import urlparse
+from collections import defaultdict
+from pathlib import Path
+from contextlib import closing
+import hashlib
+import sqlite3
+import atexit
+import threading
+from types import MappingProxyType
 import os
-import subprocess
-import sys
-import platform
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Function to install system dependencies for headless servers
-def install_system_dependencies():
-    """Install Chromium and dependencies for headless servers"""
-    try:
-        system = platform.system().lower()
-        
-        if system == "linux":
-            st.info("🔧 Installing Chromium dependencies for headless server...")
-            
-            # Update package list and install chromium
-            commands = [
-                "apt-get update -y",
-                "apt-get install -y chromium-browser chromium-chromedriver",
-                "apt-get install -y fonts-liberation libasound2 libatk-bridge2.0-0 libdrm2 libxcomposite1 libxdamage1 libxrandr2 libgbm1 libxss1 libnss3"
-            ]
-            
-            for cmd in commands:
-                try:
-                    result = subprocess.run(cmd.split(), capture_output=True, text=True, timeout=300)
-                    if result.returncode != 0:
-                        st.warning(f"Command failed: {cmd}")
-                        st.warning(f"Error: {result.stderr}")
-                except subprocess.TimeoutExpired:
-                    st.warning(f"Command timed out: {cmd}")
-                except Exception as e:
-                    st.warning(f"Error running command {cmd}: {str(e)}")
-            
-            st.success("✅ System dependencies installed successfully!")
-            return True
-            
-        else:
-            st.info("🖥️ Non-Linux system detected. Assuming Chrome/Chromium is available.")
-            return True
-            
-    except Exception as e:
-        st.error(f"Failed to install system dependencies: {str(e)}")
-        return False
-
-# Install dependencies on first run
-if 'dependencies_installed' not in st.session_state:
-    st.session_state.dependencies_installed = install_system_dependencies()
-
 # Page configuration
 st.set_page_config(
     page_title="HR Policy Generator",
@@ -73,7 +32,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -113,14 +72,285 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static page chrome rendered on every rerun
+HEADER_HTML = '<h1 class="main-header">🏢 HR Policy Generator</h1>'
+INTRO_HTML = '<div class="info-box">Generate country-specific HR policies using AI and official government sources</div>'
+FOOTER_HTML = """
+<div style='text-align: center; color: #666; font-size: 0.8rem;'>
+    ⚠️ <strong>Disclaimer:</strong> This tool generates draft policies for reference only. 
+    Always consult with qualified legal professionals before implementing any HR policies.
+    Policies should be reviewed and customized for your specific organizational needs and local regulations.
+</div>
+"""
+
+# Policy choices offered in Step 1, grouped by category
+POLICY_CATEGORIES = MappingProxyType({
+    "Employment Policies": (
+        "Employment Contract Policy",
+        "Recruitment and Selection Policy",
+        "Probationary Period Policy",
+        "Termination and Dismissal Policy"
+    ),
+    "Workplace Policies": (
+        "Anti-Harassment and Discrimination Policy",
+        "Health and Safety Policy",
+        "Remote Work Policy",
+        "Workplace Conduct Policy"
+    ),
+    "Leave and Benefits": (
+        "Annual Leave Policy",
+        "Sick Leave Policy",
+        "Maternity/Paternity Leave Policy",
+        "Bereavement Leave Policy"
+    ),
+    "Compensation": (
+        "Salary and Wage Policy",
+        "Overtime Policy",
+        "Performance Bonus Policy",
+        "Expense Reimbursement Policy"
+    ),
+    "Data and Privacy": (
+        "Employee Privacy Policy",
+        "Data Protection Policy",
+        "Confidentiality Policy",
+        "Social Media Policy"
+    )
+})
+
+# Countries offered in Step 2 without typing a custom location
+POPULAR_COUNTRIES = (
+    "United States", "United Kingdom", "Canada", "Australia", 
+    "Germany", "France", "Netherlands", "Singapore", "India", "South Africa"
+)
+
+STEP_LABELS = (
+    "Step 1: Select Policy Type",
+    "Step 2: Choose Location",
+    "Step 3: Research & Extract",
+    "Step 4: Generate Policy",
+)
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Runs of whitespace collapsed when cleaning extracted page text
+_WS_RE = re.compile(r'\s+')
+
+# Split points after sentence-ending punctuation
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+def truncate_at_sentence(text, max_chars):
+    """Cut text to at most max_chars, ending on a sentence boundary where possible"""
+    if len(text) <= max_chars:
+        return text
+    
+    kept = []
+    length = 0
+    for sentence in _SENTENCE_END_RE.split(text):
+        added = len(sentence) + (1 if kept else 0)
+        if length + added > max_chars:
+            break
+        kept.append(sentence)
+        length += added
+    
+    # A first sentence longer than max_chars falls back to a hard cut
+    return " ".join(kept) if kept else text[:max_chars]
+
+def _shingles(text, size=5):
+    # Every offset is used so duplicates shifted by leading boilerplate still line up
+    return {text[i:i + size] for i in range(max(len(text) - size, 0) + 1)}
+
+def drop_near_duplicates(items, threshold=0.8):
+    """Keep (key, text) pairs in order, skipping any whose shingle Jaccard similarity
+    with an already kept text exceeds threshold"""
+    kept = []
+    kept_shingles = []
+    for key, text in items:
+        shingles = _shingles(text)
+        if any(len(shingles & other) / (len(shingles | other) or 1) > threshold for other in kept_shingles):
+            continue
+        kept.append((key, text))
+        kept_shingles.append(shingles)
+    return kept
+
+def final_policy_key(policy_type, location):
+    """Cache key for the end result of a whole research run"""
+    return ResponseCache.make_key(
+        model=GEMINI_MODEL,
+        system=SYSTEM_PROMPT,
+        policy=policy_type,
+        location=location,
+        month=datetime.now().strftime('%Y-%m')
+    )
+
+# Unreachable hosts fail fast; slow but live pages still get the full read budget
+FETCH_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+
+# Minimum gap between requests to the same host; different hosts are not delayed
+SAME_HOST_DELAY = 1.0
+
+# Browser-like headers for fetching official source pages
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Fixed instructions sent as the model's system instruction; only the
+# per-request details go into the prompt itself
+SYSTEM_PROMPT = """
+As an expert HR policy consultant, you write comprehensive HR policies for a specific location,
+using the official legal and regulatory information provided as your primary source.
+
+Requirements:
+1. Create a professional, legally compliant policy of the requested type
+2. Include all mandatory requirements specific to the requested location
+3. Structure the policy with clear sections and subsections
+4. Include purpose, scope, definitions, procedures, and compliance requirements
+5. Add relevant legal references and citations where applicable
+6. Ensure the language is clear, professional, and actionable
+7. Include effective date and review requirements
+8. Add any location-specific cultural or legal considerations
+
+Format the policy as a complete, ready-to-implement document with:
+- Policy title and version
+- Effective date
+- Table of contents
+- All required sections
+- Appendices if needed
+"""
+
+# Cached responses older than this are ignored
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+class ResponseCache:
+    """Small SQLite cache for expensive API responses and fetched pages"""
+    def __init__(self, path, ttl=CACHE_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl = ttl
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, response TEXT, created_at INTEGER)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tavily "
+                    "(key TEXT PRIMARY KEY, results_json TEXT, ts INTEGER)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS pages "
+                    "(url TEXT PRIMARY KEY, content TEXT, etag TEXT, last_modified TEXT, ts INTEGER)"
+                )
+        except (OSError, sqlite3.Error) as e:
+            st.warning(f"Response cache disabled: {str(e)}")
+            self.path = None
+    
+    def _connect(self):
+        # A short-lived connection per call keeps the cache safe to use from any thread
+        return closing(sqlite3.connect(self.path))
+    
+    def _fetchone(self, sql, params):
+        if self.path is None:
+            return None
+        try:
+            with self._connect() as conn:
+                return conn.execute(sql, params).fetchone()
+        except sqlite3.Error:
+            return None
+    
+    def _write(self, sql, params):
+        if self.path is None:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(sql, params)
+                conn.commit()
+        except sqlite3.Error:
+            pass
+    
+    @staticmethod
+    def make_key(**parts):
+        """Build a stable cache key from JSON-serialisable parts"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired"""
+        row = self._fetchone(
+            "SELECT response FROM cache WHERE key = ? AND created_at > ?",
+            (key, int(time.time()) - self.ttl)
+        )
+        return row[0] if row else None
+    
+    def put(self, key, response):
+        """Store a response under key"""
+        self._write(
+            "INSERT OR REPLACE INTO cache (key, response, created_at) VALUES (?, ?, ?)",
+            (key, response, int(time.time()))
+        )
+    
+    def get_search(self, key):
+        """Return cached Tavily results for key, or None if missing or expired"""
+        row = self._fetchone(
+            "SELECT results_json FROM tavily WHERE key = ? AND ts > ?",
+            (key, int(time.time()) - self.ttl)
+        )
+        return json.loads(row[0]) if row else None
+    
+    def put_search(self, key, results):
+        """Store Tavily results under key"""
+        self._write(
+            "INSERT OR REPLACE INTO tavily (key, results_json, ts) VALUES (?, ?, ?)",
+            (key, json.dumps(results), int(time.time()))
+        )
+    
+    def get_page(self, url):
+        """Return (content, etag, last_modified) for a previously fetched page, or None"""
+        return self._fetchone(
+            "SELECT content, etag, last_modified FROM pages WHERE url = ?",
+            (url,)
+        )
+    
+    def put_page(self, url, content, etag=None, last_modified=None):
+        """Store the extracted text of a page along with its HTTP validators"""
+        self._write(
+            "INSERT OR REPLACE INTO pages (url, content, etag, last_modified, ts) VALUES (?, ?, ?, ?, ?)",
+            (url, content, etag, last_modified, int(time.time()))
+        )
 
 class HRPolicyGenerator:
+    TAVILY_URL = "https://api.tavily.com/search"
+    
+    # Constant part of every Tavily search request
+    _BASE_PAYLOAD = {
+        "search_depth": "advanced",
+        "include_answer": True,
+        "include_raw_content": True,
+        "max_results": 10,
+        "include_domains": ["gov", "legislation", "official", "law"]
+    }
+    
     def __init__(self):
         # Load API keys from environment variables
         self.tavily_api_key = os.getenv('TAVILY_API_KEY')
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.driver = None
+        
+        # Keep-alive session so repeated searches reuse the TLS connection
+        self.tavily_session = requests.Session()
+        self.tavily_session.headers.update({"Content-Type": "application/json"})
+        
+        # Repeat generations for the same inputs are served from disk
+        self.cache_path = Path(".cache/policies.sqlite")
+        self.cache = ResponseCache(self.cache_path)
+        
+        # Configure Gemini once per generator rather than on every generation
+        self._model = None
+        if self.gemini_api_key:
+            genai.configure(api_key=self.gemini_api_key)
+            self._model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=SYSTEM_PROMPT)
         
         # Check if API keys are available
         if not self.tavily_api_key:
@@ -128,131 +358,6 @@ class HRPolicyGenerator:
         if not self.gemini_api_key:
             st.error("❌ GEMINI_API_KEY not found in .env file")
         
-    def setup_selenium(self):
-        """Setup Selenium WebDriver with Chrome/Chromium options for headless servers"""
-        try:
-            chrome_options = Options()
-            
-            # Essential headless options
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-software-rasterizer")
-            chrome_options.add_argument("--disable-background-timer-throttling")
-            chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-            chrome_options.add_argument("--disable-renderer-backgrounding")
-            chrome_options.add_argument("--disable-features=TranslateUI")
-            chrome_options.add_argument("--disable-ipc-flooding-protection")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--remote-debugging-port=9222")
-            
-            # User agent to avoid detection
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-            
-            # Additional options for headless servers
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--allow-running-insecure-content")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")  # Faster loading
-            chrome_options.add_argument("--disable-javascript")  # We only need text content
-            
-            # Try different approaches to find Chrome/Chromium
-            chrome_paths = [
-                "/usr/bin/chromium-browser",  # Ubuntu/Debian
-                "/usr/bin/chromium",          # Some Linux distros
-                "/usr/bin/google-chrome",     # Google Chrome on Linux
-                "/usr/bin/chrome",            # Alternative
-                "chromium-browser",           # System PATH
-                "chromium",                   # System PATH
-                "google-chrome",              # System PATH
-            ]
-            
-            driver_paths = [
-                "/usr/bin/chromedriver",      # System chromedriver
-                "/usr/lib/chromium-browser/chromedriver",  # Ubuntu location
-                "chromedriver",               # System PATH
-            ]
-            
-            # Find available Chrome binary
-            chrome_binary = None
-            for path in chrome_paths:
-                if os.path.isfile(path) or subprocess.run(['which', path], capture_output=True).returncode == 0:
-                    chrome_binary = path
-                    break
-            
-            if chrome_binary:
-                chrome_options.binary_location = chrome_binary
-                st.info(f"🌐 Using Chrome/Chromium at: {chrome_binary}")
-            
-            # Try to create WebDriver with different approaches
-            driver_created = False
-            
-            # Approach 1: Try webdriver-manager (if available)
-            if not driver_created:
-                try:
-                    from webdriver_manager.chrome import ChromeDriverManager
-                    from webdriver_manager.core.utils import ChromeType
-                    
-                    # Try regular Chrome first, then Chromium
-                    for chrome_type in [ChromeType.GOOGLE, ChromeType.CHROMIUM]:
-                        try:
-                            driver_path = ChromeDriverManager(chrome_type=chrome_type).install()
-                            service = Service(driver_path)
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                            driver_created = True
-                            st.success(f"✅ WebDriver created using webdriver-manager with {chrome_type}")
-                            break
-                        except Exception as e:
-                            continue
-                            
-                except ImportError:
-                    pass
-            
-            # Approach 2: Try system chromedriver paths
-            if not driver_created:
-                for driver_path in driver_paths:
-                    try:
-                        if os.path.isfile(driver_path) or subprocess.run(['which', driver_path], capture_output=True).returncode == 0:
-                            service = Service(driver_path)
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                            driver_created = True
-                            st.success(f"✅ WebDriver created using system chromedriver at: {driver_path}")
-                            break
-                    except Exception as e:
-                        continue
-            
-            # Approach 3: Try default Chrome (let Selenium find it)
-            if not driver_created:
-                try:
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                    driver_created = True
-                    st.success("✅ WebDriver created using default Chrome")
-                except Exception as e:
-                    pass
-            
-            if not driver_created:
-                raise Exception("Could not create WebDriver with any approach")
-                
-            # Test the driver
-            self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(10)
-            
-            return True
-            
-        except Exception as e:
-            error_msg = f"Failed to setup Selenium WebDriver: {str(e)}"
-            st.error(error_msg)
-            st.error("💡 **Troubleshooting:**")
-            st.error("1. Make sure the system dependencies are installed")
-            st.error("2. Try installing webdriver-manager: `pip install webdriver-manager`")
-            st.error("3. For manual setup, install chromium-browser and chromium-chromedriver")
-            return False
-    
     def search_tavily(self, query, location):
         """Search using Tavily API for official policy sources"""
         if not self.tavily_api_key:
@@ -262,122 +367,193 @@ class HRPolicyGenerator:
         # Enhanced query for official sources
         enhanced_query = f"{query} {location} official government policy law regulation site:gov OR site:legislation OR site:official"
         
-        url = "https://api.tavily.com/search"
-        payload = {
-            "api_key": self.tavily_api_key,
-            "query": enhanced_query,
-            "search_depth": "advanced",
-            "include_answer": True,
-            "include_raw_content": True,
-            "max_results": 10,
-            "include_domains": ["gov", "legislation", "official", "law"]
-        }
+        cache_key = ResponseCache.make_key(query=enhanced_query)
+        cached = self.cache.get_search(cache_key)
+        if cached:
+            return cached
+        
+        payload = {**self._BASE_PAYLOAD, "api_key": self.tavily_api_key, "query": enhanced_query}
         
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = self.tavily_session.post(self.TAVILY_URL, json=payload, timeout=30)
             response.raise_for_status()
-            return response.json().get('results', [])
+            results = response.json().get('results', [])
+            if results:
+                self.cache.put_search(cache_key, results)
+            return results
         except requests.exceptions.RequestException as e:
             st.error(f"Tavily search failed: {str(e)}")
             return []
     
-    def extract_content_selenium(self, url, max_chars=5000):
-        """Extract content from URL using Selenium"""
-        if not self.driver:
-            if not self.setup_selenium():
-                return ""
-        
+    async def extract_content_httpx(self, client, url, max_chars=5000):
+        """Extract content from URL using httpx and selectolax"""
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Remove unwanted elements
-            unwanted_tags = ['script', 'style', 'nav', 'header', 'footer', 'aside']
-            for tag in unwanted_tags:
-                elements = self.driver.find_elements(By.TAG_NAME, tag)
-                for element in elements:
-                    self.driver.execute_script("arguments[0].remove();", element)
-            
-            # Extract main content
-            content_selectors = [
-                'main', 'article', '.content', '.main-content', 
-                '#content', '#main', '.policy-content', '.legal-content'
-            ]
-            
-            content = ""
-            for selector in content_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        content = elements[0].get_attribute('textContent')
-                        break
-                except:
-                    continue
-            
-            if not content:
-                content = self.driver.find_element(By.TAG_NAME, "body").get_attribute('textContent')
+            # Revalidate previously fetched pages so unchanged ones skip parsing
+            headers = {}
+            cached_page = self.cache.get_page(url)
+            if cached_page:
+                _, etag, last_modified = cached_page
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+            
+            # Stream so non-HTML resources (PDFs, images, ...) are rejected from
+            # their headers without downloading the body
+            async with client.stream("GET", url, timeout=FETCH_TIMEOUT, follow_redirects=True, headers=headers) as response:
+                if response.status_code == 304 and cached_page:
+                    content = cached_page[0]
+                else:
+                    response.raise_for_status()
+                    content_type = response.headers.get('content-type', '')
+                    if content_type and 'html' not in content_type:
+                        raise ValueError(f"unsupported content type {content_type}")
+                    
+                    await response.aread()
+                    content = self._parse_content(response.text)
+                    if content:
+                        self.cache.put_page(
+                            url, content,
+                            response.headers.get('etag'),
+                            response.headers.get('last-modified')
+                        )
             
-            # Clean and limit content
-            content = re.sub(r'\s+', ' ', content).strip()
-            return content[:max_chars] if len(content) > max_chars else content
+            return truncate_at_sentence(content, max_chars)
             
         except Exception as e:
             st.warning(f"Could not extract content from {url}: {str(e)}")
             return ""
     
-    def generate_policy_with_gemini(self, policy_type, location, extracted_data):
-        """Generate policy using Gemini AI"""
-        if not self.gemini_api_key:
-            st.error("Gemini API key not provided")
-            return ""
+    def _parse_content(self, html):
+        """Return the cleaned main text of an HTML page"""
+        tree = LexborHTMLParser(html)
+        
+        # Remove unwanted elements in a single pass over the tree
+        tree.strip_tags(['script', 'style', 'nav', 'header', 'footer', 'aside'])
+        
+        # Extract main content
+        content_selectors = [
+            'main', 'article', '.content', '.main-content', 
+            '#content', '#main', '.policy-content', '.legal-content'
+        ]
+        
+        # Take the first selector whose element actually has text, so an empty
+        # <main> placeholder doesn't hide an <article> or #content further down
+        content = ""
+        for selector in content_selectors:
+            node = tree.css_first(selector)
+            if node is not None:
+                content = node.text().strip()
+                if content:
+                    break
         
+        if not content and tree.body is not None:
+            content = tree.body.text()
+        
+        # Clean content
+        return _WS_RE.sub(' ', content).strip()
+    
+    async def extract_all(self, urls, max_chars=5000, on_progress=None):
+        """Fetch and extract all URLs concurrently over one shared HTTP client
+        
+        Returns a dict of url -> content; on_progress(done, url) is called as each page finishes.
+        """
+        # Requests to the same host queue behind each other, SAME_HOST_DELAY apart
+        host_locks = defaultdict(asyncio.Lock)
+        last_hit = {}
+        
+        async def wait_for_host(host):
+            async with host_locks[host]:
+                if host in last_hit:
+                    gap = time.monotonic() - last_hit[host]
+                    if gap < SAME_HOST_DELAY:
+                        await asyncio.sleep(SAME_HOST_DELAY - gap)
+                last_hit[host] = time.monotonic()
+        
+        async def extract(client, url):
+            await wait_for_host(urlparse(url).netloc)
+            return url, await self.extract_content_httpx(client, url, max_chars)
+        
+        extracted = {}
+        async with httpx.AsyncClient(http2=True, headers=REQUEST_HEADERS) as client:
+            tasks = [extract(client, url) for url in urls]
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                url, content = await task
+                extracted[url] = content
+                if on_progress:
+                    on_progress(done, url)
+        return extracted
+    
+    def warm_up_gemini(self):
+        """Open the Gemini connection ahead of the first generation (safe to call from a worker thread)"""
+        if not self._model:
+            return
         try:
-            genai.configure(api_key=self.gemini_api_key)
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
-            prompt = f"""
-            As an expert HR policy consultant, create a comprehensive {policy_type} policy for {location}.
-            
-            Use the following official legal and regulatory information as your primary source:
-            
-            {extracted_data}
-            
-            Requirements:
-            1. Create a professional, legally compliant {policy_type} policy
-            2. Include all mandatory requirements specific to {location}
-            3. Structure the policy with clear sections and subsections
-            4. Include purpose, scope, definitions, procedures, and compliance requirements
-            5. Add relevant legal references and citations where applicable
-            6. Ensure the language is clear, professional, and actionable
-            7. Include effective date and review requirements
-            8. Add any location-specific cultural or legal considerations
-            
-            Format the policy as a complete, ready-to-implement document with:
-            - Policy title and version
-            - Effective date
-            - Table of contents
-            - All required sections
-            - Appendices if needed
-            
-            Make sure the policy is current as of {datetime.now().strftime('%B %Y')} and complies with the latest regulations.
-            """
-            
-            response = model.generate_content(prompt)
-            return response.text
-            
-        except Exception as e:
-            st.error(f"Failed to generate policy with Gemini: {str(e)}")
-            return ""
+            # count_tokens is free and goes through the same client as generate_content
+            self._model.count_tokens(SYSTEM_PROMPT, request_options={"timeout": 10})
+        except Exception:
+            pass
+    
+    def generate_policy_with_gemini_stream(self, policy_type, location, extracted_data, use_cache=True):
+        """Generate policy using Gemini AI, yielding text chunks as they arrive
+        
+        Errors from Gemini are raised to the caller, which may already have rendered
+        part of the stream. With use_cache=False a fresh generation is always made
+        (and still stored in the cache).
+        """
+        if not self._model:
+            st.error("Gemini API key not provided")
+            return
+        
+        cache_key = ResponseCache.make_key(
+            model=GEMINI_MODEL,
+            system=SYSTEM_PROMPT,
+            policy=policy_type,
+            location=location,
+            data=extracted_data,
+            month=datetime.now().strftime('%Y-%m')
+        )
+        cached = self.cache.get(cache_key) if use_cache else None
+        if cached:
+            yield cached
+            return
+        
+        prompt = f"""
+        Create a comprehensive {policy_type} policy for {location}.
+        
+        Use the following official legal and regulatory information as your primary source:
+        
+        {extracted_data}
+        
+        Make sure the policy is current as of {datetime.now().strftime('%B %Y')} and complies with the latest regulations.
+        """
+        
+        response = self._model.generate_content(prompt, stream=True)
+        
+        chunks = []
+        for chunk in response:
+            # Chunks without parts (e.g. the final finish_reason chunk) carry no text
+            if chunk.parts:
+                chunks.append(chunk.text)
+                yield chunk.text
+        
+        # Only complete generations are cached
+        if chunks:
+            self.cache.put(cache_key, "".join(chunks))
     
     def cleanup(self):
         """Cleanup resources"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        self.tavily_session.close()
+
+@st.cache_resource
+def get_generator():
+    """Return the generator shared across reruns and sessions, keeping its HTTP session and model warm"""
+    generator = HRPolicyGenerator()
+    atexit.register(generator.cleanup)
+    
+    # Open the Gemini connection once, in the background, so nothing ever waits on it
+    threading.Thread(target=generator.warm_up_gemini, daemon=True).start()
+    return generator
 
 # Initialize session state
 if 'step' not in st.session_state:
@@ -388,11 +564,13 @@ if 'location' not in st.session_state:
     st.session_state.location = ""
 if 'generated_policy' not in st.session_state:
     st.session_state.generated_policy = ""
+if 'regenerate' not in st.session_state:
+    st.session_state.regenerate = False
 
 # Main app
 def main():
-    st.markdown('<h1 class="main-header">🏢 HR Policy Generator</h1>', unsafe_allow_html=True)
-    st.markdown('<div class="info-box">Generate country-specific HR policies using AI and official government sources</div>', unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+    st.markdown(INTRO_HTML, unsafe_allow_html=True)
     
     # Sidebar for API status and info
     with st.sidebar:
@@ -409,20 +587,9 @@ def main():
             st.error("⚠️ Create a .env file with:\n```\nTAVILY_API_KEY=your_key_here\nGEMINI_API_KEY=your_key_here\n```")
         
         st.header("📋 Progress")
-        step_status = ["❌", "❌", "❌", "❌"]
-        if st.session_state.step > 1:
-            step_status[0] = "✅"
-        if st.session_state.step > 2:
-            step_status[1] = "✅"
-        if st.session_state.step > 3:
-            step_status[2] = "✅"
-        if st.session_state.step > 4:
-            step_status[3] = "✅"
-            
-        st.write(f"{step_status[0]} Step 1: Select Policy Type")
-        st.write(f"{step_status[1]} Step 2: Choose Location")
-        st.write(f"{step_status[2]} Step 3: Research & Extract")
-        st.write(f"{step_status[3]} Step 4: Generate Policy")
+        step_status = ["✅" if st.session_state.step > i else "❌" for i in range(1, 5)]
+        for status, label in zip(step_status, STEP_LABELS):
+            st.write(f"{status} {label}")
     
     # Step 1: Policy Type Selection
     if st.session_state.step == 1:
@@ -430,41 +597,8 @@ def main():
         
         col1, col2 = st.columns([2, 1])
         with col1:
-            policy_categories = {
-                "Employment Policies": [
-                    "Employment Contract Policy",
-                    "Recruitment and Selection Policy",
-                    "Probationary Period Policy",
-                    "Termination and Dismissal Policy"
-                ],
-                "Workplace Policies": [
-                    "Anti-Harassment and Discrimination Policy",
-                    "Health and Safety Policy",
-                    "Remote Work Policy",
-                    "Workplace Conduct Policy"
-                ],
-                "Leave and Benefits": [
-                    "Annual Leave Policy",
-                    "Sick Leave Policy",
-                    "Maternity/Paternity Leave Policy",
-                    "Bereavement Leave Policy"
-                ],
-                "Compensation": [
-                    "Salary and Wage Policy",
-                    "Overtime Policy",
-                    "Performance Bonus Policy",
-                    "Expense Reimbursement Policy"
-                ],
-                "Data and Privacy": [
-                    "Employee Privacy Policy",
-                    "Data Protection Policy",
-                    "Confidentiality Policy",
-                    "Social Media Policy"
-                ]
-            }
-            
-            selected_category = st.selectbox("Select Policy Category", list(policy_categories.keys()))
-            selected_policy = st.selectbox("Select Specific Policy", policy_categories[selected_category])
+            selected_category = st.selectbox("Select Policy Category", list(POLICY_CATEGORIES.keys()))
+            selected_policy = st.selectbox("Select Specific Policy", POLICY_CATEGORIES[selected_category])
             
             # Custom policy option
             st.write("Or enter a custom policy type:")
@@ -491,15 +625,10 @@ def main():
         col1, col2 = st.columns([2, 1])
         with col1:
             # Country selection with popular options
-            popular_countries = [
-                "United States", "United Kingdom", "Canada", "Australia", 
-                "Germany", "France", "Netherlands", "Singapore", "India", "South Africa"
-            ]
-            
             location_type = st.radio("Choose location type:", ["Popular Countries", "Custom Location"])
             
             if location_type == "Popular Countries":
-                location = st.selectbox("Select Country", popular_countries)
+                location = st.selectbox("Select Country", POPULAR_COUNTRIES)
             else:
                 location = st.text_input("Enter Country/Region", placeholder="e.g., New Zealand, European Union, etc.")
             
@@ -531,16 +660,27 @@ def main():
     elif st.session_state.step == 3:
         st.markdown('<div class="step-header">Step 3: Research & Extract Legal Information</div>', unsafe_allow_html=True)
         st.info(f"**Policy:** {st.session_state.policy_type} | **Location:** {st.session_state.location}")
+        if st.session_state.regenerate:
+            st.caption("🔄 A fresh policy will be generated; previously cached policies are ignored.")
         
         # Check API keys from environment
         if not os.getenv('TAVILY_API_KEY') or not os.getenv('GEMINI_API_KEY'):
             st.error("⚠️ Missing API keys. Please check your .env file contains both TAVILY_API_KEY and GEMINI_API_KEY")
             return
         
-        # Initialize the generator
-        generator = HRPolicyGenerator()
+        # Reuse the shared generator
+        generator = get_generator()
         
         if st.button("🔍 Start Research Process", type="primary"):
+            # A finished policy for this pair skips search, extraction and generation entirely,
+            # unless the user came back from Step 4 to regenerate it
+            final_key = final_policy_key(st.session_state.policy_type, st.session_state.location)
+            cached_policy = None if st.session_state.regenerate else generator.cache.get(final_key)
+            if cached_policy:
+                st.session_state.generated_policy = cached_policy
+                st.session_state.step = 4
+                st.rerun()
+            
             try:
                 with st.spinner("🔍 Searching for official policy sources..."):
                     search_results = generator.search_tavily(st.session_state.policy_type, st.session_state.location)
@@ -566,38 +706,60 @@ def main():
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
-                for i, result in enumerate(search_results[:5]):  # Process top 5 sources
-                    url = result.get('url', '')
-                    if url:
-                        status_text.text(f"Extracting from source {i+1}/5: {urlparse(url).netloc}")
-                        
-                        content = generator.extract_content_selenium(url)
-                        if content:
-                            all_extracted_data += f"\n\n--- SOURCE: {result.get('title', 'Unknown')} ({url}) ---\n{content}"
-                            successful_extractions += 1
-                        
-                        progress_bar.progress((i + 1) / 5)
-                        time.sleep(1)  # Rate limiting
+                sources = [result for result in search_results[:5] if result.get('url')]  # Process top 5 sources
+                
+                def show_progress(done, url):
+                    status_text.text(f"Extracted source {done}/{len(sources)}: {urlparse(url).netloc}")
+                    progress_bar.progress(done / len(sources))
+                
+                # All pages are fetched concurrently in a single event loop
+                extracted = asyncio.run(generator.extract_all(
+                    [result['url'] for result in sources],
+                    on_progress=show_progress
+                ))
+                
+                # Assemble in search-rank order rather than completion order,
+                # leaving out sources that repeat text already kept (e.g. sibling .gov pages)
+                extracted_sources = [
+                    (result, extracted[result['url']])
+                    for result in sources if extracted.get(result['url'])
+                ]
+                unique_sources = drop_near_duplicates(extracted_sources)
+                
+                for result, content in unique_sources:
+                    all_extracted_data += f"\n\n--- SOURCE: {result.get('title', 'Unknown')} ({result['url']}) ---\n{content}"
+                    successful_extractions += 1
                 
                 status_text.empty()
                 progress_bar.empty()
                 
+                duplicates = len(extracted_sources) - len(unique_sources)
+                if duplicates:
+                    st.info(f"Skipped {duplicates} near-duplicate source(s)")
+                
                 if successful_extractions == 0:
                     st.error("Could not extract content from any sources. Please try again or check your internet connection.")
                     return
                 
                 st.success(f"Successfully extracted data from {successful_extractions} sources")
                 
-                # Generate policy
-                with st.spinner("🤖 Generating policy with AI..."):
-                    generated_policy = generator.generate_policy_with_gemini(
+                # Generate policy, rendering it as it streams in
+                st.markdown("#### 🤖 Generating policy with AI...")
+                try:
+                    generated_policy = st.write_stream(generator.generate_policy_with_gemini_stream(
                         st.session_state.policy_type,
                         st.session_state.location,
-                        all_extracted_data
-                    )
+                        all_extracted_data,
+                        use_cache=not st.session_state.regenerate
+                    ))
+                except Exception as e:
+                    st.error(f"Failed to generate policy with Gemini: {str(e)}")
+                    generated_policy = ""
                 
                 if generated_policy:
+                    generator.cache.put(final_key, generated_policy)
                     st.session_state.generated_policy = generated_policy
+                    st.session_state.regenerate = False
                     st.session_state.step = 4
                     st.success("Policy generated successfully!")
                     time.sleep(1)
@@ -607,11 +769,10 @@ def main():
                 
             except Exception as e:
                 st.error(f"An error occurred during the research process: {str(e)}")
-            finally:
-                generator.cleanup()
         
         if st.button("← Back to Location Selection"):
             st.session_state.step = 2
+            st.session_state.regenerate = False  # Only applies to the policy being modified
             st.rerun()
     
     # Step 4: Display Generated Policy
@@ -664,7 +825,7 @@ def main():
         with col1:
             if st.button("🆕 Generate New Policy", type="primary"):
                 # Reset session state
-                for key in ['step', 'policy_type', 'location', 'generated_policy']:
+                for key in ['step', 'policy_type', 'location', 'generated_policy', 'regenerate']:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()
@@ -672,6 +833,7 @@ def main():
         with col2:
             if st.button("📝 Modify Current Policy"):
                 st.session_state.step = 3  # Go back to research step
+                st.session_state.regenerate = True  # Bypass cached policies on the next run
                 st.rerun()
         
         with col3:
@@ -680,13 +842,7 @@ def main():
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666; font-size: 0.8rem;'>
-        ⚠️ <strong>Disclaimer:</strong> This tool generates draft policies for reference only. 
-        Always consult with qualified legal professionals before implementing any HR policies.
-        Policies should be reviewed and customized for your specific organizational needs and local regulations.
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
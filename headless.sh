@@ -13,36 +13,6 @@ apt-get update -y
 echo "🐍 Installing Python dependencies..."
 apt-get install -y python3 python3-pip python3-venv
 
-# Install Chromium and ChromeDriver
-echo "🌐 Installing Chromium browser and driver..."
-apt-get install -y chromium-browser chromium-chromedriver
-
-# Install additional dependencies for Chromium
-echo "🔧 Installing Chromium dependencies..."
-apt-get install -y \
-    fonts-liberation \
-    libasound2 \
-    libatk-bridge2.0-0 \
-    libdrm2 \
-    libxcomposite1 \
-    libxdamage1 \
-    libxrandr2 \
-    libgbm1 \
-    libxss1 \
-    libnss3 \
-    libatk1.0-0 \
-    libcups2 \
-    libdbus-1-3 \
-    libgtk-3-0 \
-    libx11-xcb1 \
-    libxcb-dri3-0 \
-    libxcomposite1 \
-    libxcursor1 \
-    libxi6 \
-    libxtst6 \
-    wget \
-    xvfb
-
 # Install Python packages
 echo "📚 Installing Python packages..."
 pip3 install -r requirements.txt
@@ -50,23 +20,9 @@ pip3 install -r requirements.txt
 # Verify installations
 echo "✅ Verifying installations..."
 
-# Check Chromium
-if command -v chromium-browser &> /dev/null; then
-    echo "✓ Chromium browser installed: $(chromium-browser --version)"
-else
-    echo "❌ Chromium browser not found"
-fi
-
-# Check ChromeDriver
-if command -v chromedriver &> /dev/null; then
-    echo "✓ ChromeDriver installed: $(chromedriver --version)"
-else
-    echo "❌ ChromeDriver not found"
-fi
-
 # Check Python packages
 echo "✓ Checking Python packages..."
-python3 -c "import streamlit, selenium, google.generativeai, requests, dotenv; print('All Python packages installed successfully')"
+python3 -c "import streamlit, httpx, selectolax, google.generativeai, requests, dotenv; print('All Python packages installed successfully')"
 
 # Set up environment file
 if [ ! -f ".env" ]; then
@@ -101,5 +57,3 @@ echo "   ./start_app.sh"
 echo ""
 echo "3. Access the app at: http://your-server-ip:8501"
 echo ""
-echo "🔧 For manual testing of Chromium:"
-echo "   chromium-browser --headless --no-sandbox --dump-dom https://www.google.com"
\ No newline at end of file
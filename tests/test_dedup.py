@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import drop_near_duplicates, truncate_at_sentence
+
+
+BASE_TEXT = " ".join(
+    f"Section {i}: employees are entitled to {i % 30} days of paid leave under regulation {i * 7}."
+    for i in range(100)
+)
+
+
+def test_shifted_duplicates_are_dropped():
+    for prefix in ["X", "XY", "XYZ", "Home "]:
+        kept = drop_near_duplicates([("original", BASE_TEXT), ("copy", prefix + BASE_TEXT)])
+        assert [key for key, _ in kept] == ["original"], prefix
+
+
+def test_distinct_sources_are_kept():
+    other = " ".join(f"Sick pay rule {i} applies after {i} weeks of service." for i in range(100))
+    kept = drop_near_duplicates([("a", BASE_TEXT), ("b", other)])
+    assert [key for key, _ in kept] == ["a", "b"]
+
+
+def test_truncate_at_sentence_boundary():
+    text = "One sentence here. Two is here! Three? Four."
+    assert truncate_at_sentence(text, 19) == "One sentence here."
+    assert truncate_at_sentence(text, 5) == "One s"
+    assert truncate_at_sentence(text, 100) == text
@@ -0,0 +1,20 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import HRPolicyGenerator
+
+
+def parse(html):
+    return HRPolicyGenerator.__new__(HRPolicyGenerator)._parse_content(html)
+
+
+def test_inline_tags_do_not_add_spaces_before_punctuation():
+    html = "<body><main><p>See <a href='#'>s. 12</a>, which applies.</p>\n<p>Hello <b>world</b>. Second.</p></main></body>"
+    assert parse(html) == "See s. 12, which applies. Hello world. Second."
+
+
+def test_unwanted_tags_are_removed():
+    html = "<body><nav>Menu</nav><main>Leave <script>track()</script>rules</main><footer>Footer</footer></body>"
+    assert parse(html) == "Leave rules"